@@ -19,7 +19,6 @@ Architecture:
   ui/tab_add_product.py → Tab 4: add custom products
   ui/components.py    → shared UI helpers
 """
-import time
 import logging
 
 import streamlit as st
@@ -41,13 +40,15 @@ st.set_page_config(
 )
 
 # ── Remaining imports ─────────────────────────────────────────────────────
-from styles import APP_CSS
+from styles import FONT_LINKS, get_critical_css, get_deferred_css
 from cloudinary_client import init_cloudinary
 from database import load_cart_from_db, migrate_old_custom_items
-from data_loader import load_data_cached
+from data_loader import load_data_cached, current_data_version
+from cart import rebuild_cart_index
 
-# ── Inject CSS ────────────────────────────────────────────────────────────
-st.markdown(APP_CSS, unsafe_allow_html=True)
+# ── Inject fonts + critical CSS (deferred CSS goes in after the tabs) ─────
+st.markdown(FONT_LINKS, unsafe_allow_html=True)
+st.markdown(get_critical_css(), unsafe_allow_html=True)
 
 # ── Initialize Cloudinary SDK ─────────────────────────────────────────────
 init_cloudinary()
@@ -62,7 +63,6 @@ _defaults = {
     "selected_subcategories_multi": [],
     "item_search_query":            "",
     "master_pid_map":               {},
-    "data_timestamp":               time.time(),
 }
 for key, val in _defaults.items():
     if key not in st.session_state:
@@ -71,11 +71,13 @@ for key, val in _defaults.items():
 # Load persisted cart from JSON DB on first run only
 if st.session_state.cart is None:
     st.session_state.cart = load_cart_from_db()
+    rebuild_cart_index()
 
 # ── One-time migration from legacy custom_products.json ──────────────────
 migrate_old_custom_items()
 
-# ── Load product data (cached; bust cache by updating data_timestamp) ─────
+# ── Load product data (cached; shared by all sessions per data version) ───
+st.session_state.data_timestamp = current_data_version()
 products_df = load_data_cached(st.session_state.data_timestamp)
 
 # Rebuild fast ProductID → row lookup map
@@ -88,11 +90,12 @@ from ui.sidebar import render_sidebar
 render_sidebar()
 
 # ── Main title banner ─────────────────────────────────────────────────────
+# Text is stored upper-case (no CSS text-transform pass on the banner).
 st.markdown(
-    """
+    f"""
     <div class="main-title">
-        <span class="title-brand">HEM Product Catalogue</span>
-        <span class="title-sub">Premium Incense &amp; Fragrance Collection — Export Edition</span>
+        <span class="title-brand">{APP_TITLE}</span>
+        <span class="title-sub">PREMIUM INCENSE &amp; FRAGRANCE COLLECTION — EXPORT EDITION</span>
     </div>
     """,
     unsafe_allow_html=True,
@@ -115,14 +118,19 @@ from ui.tab_review      import render_review_tab
 from ui.tab_export      import render_export_tab
 from ui.tab_add_product import render_add_product_tab
 
-with tab1:
-    render_filter_tab(products_df)
+try:
+    with tab1:
+        render_filter_tab(products_df)
 
-with tab2:
-    render_review_tab()
+    with tab2:
+        render_review_tab()
 
-with tab3:
-    render_export_tab(products_df)
+    with tab3:
+        render_export_tab(products_df)
 
-with tab4:
-    render_add_product_tab(products_df)
+    with tab4:
+        render_add_product_tab(products_df)
+finally:
+    # ── Deferred CSS — sent last so it never delays the header/tabs ──────
+    # (also on st.rerun()/errors, so the page is never left half-styled)
+    st.markdown(get_deferred_css(), unsafe_allow_html=True)
@@ -3,6 +3,7 @@ HEM Product Catalogue - Cart Module
 Shopping cart operations with duplicate detection.
 """
 import logging
+from collections import Counter
 
 import pandas as pd
 import streamlit as st
@@ -13,9 +14,110 @@ from database import save_cart_to_db
 logger = logging.getLogger(__name__)
 
 
+# =========================================================================
+# Derived Cart Index (maintained on mutation, read O(1) per render)
+# =========================================================================
+
+def _bump_cart_version():
+    st.session_state.cart_version = st.session_state.get("cart_version", 0) + 1
+
+
+def rebuild_cart_index():
+    """Recompute derived cart state from scratch.
+    Call after replacing st.session_state.cart wholesale (DB load, template load)
+    or editing item fields in place."""
+    cart = st.session_state.cart
+    st.session_state.cart_category_counts = Counter(
+        item.get("Category", "") for item in cart
+    )
+    st.session_state.cart_pid_set = {item.get("ProductID") for item in cart}
+    _bump_cart_version()
+
+
+def _ensure_cart_index():
+    """Build the derived cart state lazily on first use."""
+    if "cart_category_counts" not in st.session_state or "cart_pid_set" not in st.session_state:
+        rebuild_cart_index()
+
+
+def _category_counts():
+    """Category → item count for the cart."""
+    _ensure_cart_index()
+    return st.session_state.cart_category_counts
+
+
+def get_cart_pids():
+    """Set of ProductIDs in the cart (shared — do not mutate)."""
+    _ensure_cart_index()
+    return st.session_state.cart_pid_set
+
+
+def _index_added(items):
+    _category_counts().update(item.get("Category", "") for item in items)
+    get_cart_pids().update(item.get("ProductID") for item in items)
+    _bump_cart_version()
+
+
+def _index_removed(items):
+    counts = _category_counts()
+    counts.subtract(item.get("Category", "") for item in items)
+    st.session_state.cart_category_counts = +counts   # drop zero counts
+    get_cart_pids().difference_update(item.get("ProductID") for item in items)
+    _bump_cart_version()
+
+
+def get_cart_categories():
+    """Sorted list of distinct categories currently in the cart."""
+    return sorted(_category_counts())
+
+
+def _per_cart_version(cache_key, build):
+    """Return build()'s result, rebuilt only when cart_version changes."""
+    version = st.session_state.get("cart_version", 0)
+    cached  = st.session_state.get(cache_key)
+    if cached is None or cached[0] != version:
+        cached = (version, build())
+        st.session_state[cache_key] = cached
+    return cached[1]
+
+
+def get_cart_df():
+    """Columnar snapshot of the cart (one column per CART_COLUMNS entry).
+
+    Built once per cart_version and shared by the Review and Export tabs,
+    so the list of dicts is only walked after the cart actually changes.
+    Treat the result as read-only — derive with .assign() / slicing.
+    """
+    return _per_cart_version(
+        "_cart_df_cache",
+        lambda: pd.DataFrame.from_records(
+            st.session_state.cart, columns=CART_COLUMNS
+        ).fillna(""),
+    )
+
+
+def get_cart_names_lc():
+    """Lower-cased ItemName per row of get_cart_df(), as a numpy str array.
+    Built once per cart_version for the Review tab's in-cart search."""
+    return _per_cart_version(
+        "_cart_names_lc_cache",
+        lambda: get_cart_df()["ItemName"].astype(str).str.lower().to_numpy(dtype=str),
+    )
+
+
+def update_cart_items(changes_by_pid):
+    """Apply {ProductID: {field: value}} edits to cart items and persist."""
+    for item in st.session_state.cart:
+        delta = changes_by_pid.get(item.get("ProductID"))
+        if delta:
+            item.update(delta)
+    rebuild_cart_index()
+    save_cart_to_db(st.session_state.cart)
+
+
 def add_to_cart(selected_df):
     """Add products to cart from a DataFrame. Skips duplicates with a toast."""
-    current_pids = {item["ProductID"] for item in st.session_state.cart}
+    current_pids = set(get_cart_pids())
     new_items = []
     duplicate_count = 0
 
@@ -32,6 +134,7 @@ def add_to_cart(selected_df):
 
     if new_items:
         st.session_state.cart.extend(new_items)
+        _index_added(new_items)
         st.session_state.gen_pdf_bytes = None
         st.session_state.gen_excel_bytes = None
         save_cart_to_db(st.session_state.cart)
@@ -48,10 +151,11 @@ def remove_from_cart(pids_to_remove):
     """Remove products from cart by ProductID set."""
     if pids_to_remove:
         pids_set = set(pids_to_remove) if not isinstance(pids_to_remove, set) else pids_to_remove
-        st.session_state.cart = [
-            i for i in st.session_state.cart
-            if i.get("ProductID") not in pids_set
-        ]
+        kept, removed = [], []
+        for i in st.session_state.cart:
+            (removed if i.get("ProductID") in pids_set else kept).append(i)
+        st.session_state.cart = kept
+        _index_removed(removed)
     st.session_state.gen_pdf_bytes = None
     st.session_state.gen_excel_bytes = None
     save_cart_to_db(st.session_state.cart)
@@ -60,45 +164,59 @@ def remove_from_cart(pids_to_remove):
 def clear_cart():
     """Remove all items from cart."""
     st.session_state.cart = []
+    st.session_state.cart_category_counts = Counter()
+    st.session_state.cart_pid_set = set()
+    _bump_cart_version()
     st.session_state.gen_pdf_bytes = None
     st.session_state.gen_excel_bytes = None
     save_cart_to_db([])
 
 
+def get_picked_pids():
+    """ProductIDs ticked in the Filter tab's product grids (one shared set,
+    independent of which grids are currently rendered)."""
+    return st.session_state.setdefault("picked_pids", set())
+
+
+def _reset_product_grids(pids):
+    """Untick pids and drop the grids' widget state so they re-read the set."""
+    get_picked_pids().difference_update(pids)
+    for key in [k for k in st.session_state.keys() if str(k).startswith("grid_")]:
+        del st.session_state[key]
+
+
 def add_selected_visible_to_cart(df_visible):
-    """Add only the checkbox-selected products that are currently visible."""
+    """Add the ticked products (get_picked_pids()) that are currently visible."""
     pid_map = st.session_state.get('master_pid_map', {})
-    visible_pids = set(df_visible['ProductID'].tolist())
-    current_cart_pids = {
-        item["ProductID"] for item in st.session_state.cart if "ProductID" in item
-    }
+    picked = get_picked_pids()
+    picked_visible = [pid for pid in df_visible['ProductID'].tolist() if pid in picked]
+    current_cart_pids = set(get_cart_pids())
 
     new_items = []
     duplicate_count = 0
 
-    for key, is_checked in st.session_state.items():
-        if key.startswith("checkbox_") and is_checked:
-            pid = key.replace("checkbox_", "")
-            if pid not in visible_pids:
-                continue
-            if pid in current_cart_pids:
-                duplicate_count += 1
-                continue
-            product_data = pid_map.get(pid)
-            if product_data:
-                row_series = pd.Series(product_data)
-                new_items.append(
-                    {col: row_series.get(col, '') for col in CART_COLUMNS}
-                )
+    for pid in picked_visible:
+        if pid in current_cart_pids:
+            duplicate_count += 1
+            continue
+        product_data = pid_map.get(pid)
+        if product_data:
+            row_series = pd.Series(product_data)
+            new_items.append(
+                {col: row_series.get(col, '') for col in CART_COLUMNS}
+            )
+            current_cart_pids.add(pid)
 
     if new_items:
         st.session_state.cart.extend(new_items)
+        _index_added(new_items)
         st.session_state.gen_pdf_bytes = None
         st.session_state.gen_excel_bytes = None
         save_cart_to_db(st.session_state.cart)
         st.toast(f"Added {len(new_items)} selected items to cart!", icon="\U0001f6d2")
     else:
         st.toast("No new items selected.", icon="\u2139\ufe0f")
+    _reset_product_grids(picked_visible)
 
     if duplicate_count > 0:
         st.toast(
@@ -113,6 +231,6 @@ def clear_filters_dropdown():
     st.session_state.selected_categories_multi = []
     st.session_state.selected_subcategories_multi = []
     st.session_state.item_search_query = ""
-    for key in ["item_search_input", "category_multiselect", "subcategory_multiselect"]:
+    for key in ["_search_input_key", "category_multiselect", "subcategory_multiselect"]:
         if key in st.session_state:
             del st.session_state[key]
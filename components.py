@@ -1,6 +1,6 @@
 """
 HEM Product Catalogue v3 — Shared UI Components
-Reusable widgets: confirm dialogs, thumbnails, stats bar, section headers.
+Reusable widgets: confirm dialogs, stats bar, section headers, pagination.
 """
 import streamlit as st
 
@@ -39,21 +39,6 @@ def confirm_action(key: str, label: str, message: str, danger: bool = False) ->
         return False
 
 
-# ── Product thumbnail ─────────────────────────────────────────────────────
-def product_thumbnail_html(image_b64: str, size: int = 38) -> str:
-    """Return an <img> or placeholder <div> for a product thumbnail."""
-    if image_b64 and len(str(image_b64)) > 100:
-        return (
-            f'<img src="data:image/jpeg;base64,{image_b64}" '
-            f'class="product-thumb" '
-            f'style="width:{size}px;height:{size}px;object-fit:cover;" />'
-        )
-    return (
-        f'<div class="product-thumb-placeholder" '
-        f'style="width:{size}px;height:{size}px;font-size:9px;">—</div>'
-    )
-
-
 # ── Stats bar ─────────────────────────────────────────────────────────────
 def stats_bar(items: list) -> None:
     """
@@ -61,7 +46,7 @@ def stats_bar(items: list) -> None:
     items = list of (label, value) tuples.
     """
     spans = "".join(
-        f'<span class="stat-item">{lbl}'
+        f'<span class="stat-item">{str(lbl).upper()}'
         f'<span class="stat-value">{val}</span></span>'
         for lbl, val in items
     )
@@ -83,6 +68,43 @@ def gold_divider() -> None:
     st.markdown('<div class="gold-divider"></div>', unsafe_allow_html=True)
 
 
+# ── Pagination ────────────────────────────────────────────────────────────
+def _shift_page(page_key: str, delta: int) -> None:
+    st.session_state[page_key] = st.session_state.get(page_key, 0) + delta
+
+
+def paginate(total: int, key: str, page_size: int = 20) -> slice:
+    """
+    Render ◀ / ▶ page controls for a list of `total` items and return the
+    slice for the current page (use as items[sl] or df.iloc[sl]).
+    Only the current page's widgets need to be built by the caller.
+    Controls are hidden when everything fits on one page.
+    """
+    page_key = f"_page_{key}"
+    n_pages  = max(1, -(-total // page_size))
+    page     = min(max(st.session_state.get(page_key, 0), 0), n_pages - 1)
+    st.session_state[page_key] = page
+
+    if n_pages > 1:
+        c_prev, c_info, c_next = st.columns([1, 4, 1])
+        with c_prev:
+            st.button("◀", key=f"{key}_prev", disabled=page == 0,
+                      on_click=_shift_page, args=(page_key, -1),
+                      use_container_width=True)
+        with c_info:
+            st.markdown(
+                f'<div style="text-align:center;font-size:12px;color:#6b4040;'
+                f'padding-top:8px;">Page {page + 1} of {n_pages} · {total} items</div>',
+                unsafe_allow_html=True,
+            )
+        with c_next:
+            st.button("▶", key=f"{key}_next", disabled=page >= n_pages - 1,
+                      on_click=_shift_page, args=(page_key, 1),
+                      use_container_width=True)
+
+    return slice(page * page_size, (page + 1) * page_size)
+
+
 # ── Empty state placeholder ───────────────────────────────────────────────
 def empty_state(icon: str, message: str) -> None:
     """Centered empty-state graphic with icon and message."""
@@ -63,6 +63,9 @@ CART_COLUMNS = [
     'Packaging', 'SerialNo', 'ImageB64', 'Catalogue', 'ProductID', 'IsNew',
 ]
 
+# ── Subcategory spellings meaning "none" (match after strip + upper) ─────────
+BLANK_SUBCATEGORIES = frozenset({"", "N/A", "NAN"})
+
 # ── UI text constants ─────────────────────────────────────────────────────────
 NO_SELECTION_PLACEHOLDER = "Select..."
 APP_TITLE = "HEM PRODUCT CATALOGUE"
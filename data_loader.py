@@ -2,22 +2,46 @@
 HEM Product Catalogue - Data Loader Module
 Excel loading, Cloudinary image matching, and cached data pipeline.
 """
+import os
+import time
 import hashlib
 import logging
+import threading
 
 import pandas as pd
 import streamlit as st
 
 from config import (
     CATALOGUE_PATHS, GLOBAL_COLUMN_MAPPING, REQUIRED_OUTPUT_COLS,
+    BLANK_SUBCATEGORIES,
 )
 from cloudinary_client import (
     get_image_as_base64_str, fetch_all_cloudinary_resources,
 )
-from database import load_products_db
+from database import load_products_db, invalidate_db_cache
 
 logger = logging.getLogger(__name__)
 
+# Process-wide data version. Every session keys load_data_cached (and the
+# derived lookups) on this one value, so all sessions share a single product
+# load; bumping it after a DB change refreshes every session on its next run.
+_DATA_VERSION = [time.time()]
+_DATA_VERSION_LOCK = threading.Lock()
+
+
+def current_data_version():
+    """Version token of the product data currently served to all sessions."""
+    with _DATA_VERSION_LOCK:
+        return _DATA_VERSION[0]
+
+
+def bump_data_version():
+    """Start a new data version (after product DB edits); returns it."""
+    with _DATA_VERSION_LOCK:
+        # Strictly increasing even if two saves land on the same clock tick
+        _DATA_VERSION[0] = max(time.time(), _DATA_VERSION[0] + 1e-6)
+        return _DATA_VERSION[0]
+
 
 # =========================================================================
 # Helper Functions
@@ -62,12 +86,14 @@ def create_safe_id(text):
 # Main Data Loading Pipeline
 # =========================================================================
 
-@st.cache_data(show_spinner="Syncing Data (Smart Match v5 + Persistent DB)...")
-def load_data_cached(_dummy_timestamp):
+@st.cache_data(show_spinner="Syncing Data (Smart Match v5 + Persistent DB)...", max_entries=2)
+def load_data_cached(data_timestamp):
     """Load all product data from Excel files, Cloudinary images, and custom products.
 
-    Uses Streamlit cache; pass a changing timestamp to bust the cache.
-    The underscore prefix on _dummy_timestamp tells Streamlit not to hash it.
+    Uses Streamlit cache keyed on data_timestamp, which app.py takes from
+    current_data_version() — shared by all sessions, so one load serves
+    them all. Call bump_data_version() after any DB change and the next
+    call rebuilds, with no need to clear unrelated caches.
     """
     all_data = []
     required_output_cols = REQUIRED_OUTPUT_COLS
@@ -92,13 +118,15 @@ def load_data_cached(_dummy_timestamp):
         st.warning(f"Cloudinary Warning: {e}")
 
     # --- B. LOAD PRODUCTS DATABASE ---
+    # The result is shared by every session, so read the DB fresh from disk
+    # rather than whatever copy the calling session happens to hold.
+    invalidate_db_cache()
     db = load_products_db()
     overrides = db.get("product_overrides", {})
     deleted_pids = set(db.get("deleted_products", []))
 
     # --- C. EXCEL LOADING & MATCHING ---
     for catalogue_name, excel_path in CATALOGUE_PATHS.items():
-        import os
         if not os.path.exists(excel_path):
             continue
         try:
@@ -226,4 +254,75 @@ def load_data_cached(_dummy_timestamp):
     st.session_state['debug_logs'] = debug_log
     if not all_data:
         return pd.DataFrame(columns=required_output_cols)
-    return pd.concat(all_data, ignore_index=True)
+    products_df = pd.concat(all_data, ignore_index=True)
+    products_df["IsCustom"] = products_df["ProductID"].astype(str).str.startswith("CUST_")
+
+    # Subcategory as a Categorical with every "no subcategory" spelling
+    # (NaN, BLANK_SUBCATEGORIES) folded into 'N/A' — lets the filter tab test
+    # membership on integer codes instead of string isin passes.
+    subcats  = products_df["Subcategory"]
+    is_blank = subcats.astype(str).str.strip().str.upper().isin(BLANK_SUBCATEGORIES)
+    products_df["_subcat_cat"] = pd.Categorical(subcats.where(~is_blank, "N/A"))
+
+    # Taxonomy columns as Categoricals (categories in first-appearance order):
+    # groupby / unique / isin work on small integer codes, and the frame
+    # stores one copy of each label instead of an object pointer per row.
+    for col in ("Catalogue", "Category", "Subcategory"):
+        products_df[col] = pd.Categorical(
+            products_df[col], categories=pd.unique(products_df[col].dropna())
+        )
+    return products_df
+
+
+# =========================================================================
+# Derived Lookups (cached per data version)
+# =========================================================================
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def build_search_index(_products_df, data_timestamp):
+    """Lower-cased copies of the searchable columns, built once per data version.
+
+    The DataFrame itself is not hashed (leading underscore); data_timestamp is
+    the cache key, so it must be bumped whenever products_df changes.
+    Returns a dict aligned to _products_df's rows:
+      name_lc, cat_lc – lower-cased Series (exact-match duplicate checks)
+      blob            – object ndarray of name / fragrance / SKU joined by a
+                        unit separator and lower-cased, so a global search is
+                        one substring test per row (the separator stops a
+                        match from spanning two fields)
+    """
+    def _lower(col):
+        # (via object so Categorical columns accept the "" fill)
+        return _products_df[col].astype(object).fillna("").astype(str).str.lower()
+
+    name_lc = _lower("ItemName")
+    blob    = name_lc + "\x1f" + _lower("Fragrance") + "\x1f" + _lower("SKU Code")
+    return {
+        "name_lc": name_lc,
+        "cat_lc":  _lower("Category"),
+        "blob":    blob.to_numpy(dtype=object),
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def build_taxonomy(_products_df, data_timestamp):
+    """Catalogue → Category → [Subcategory] tree, built once per data version.
+
+    Returns (tree, catalogue_rows, category_rows):
+      tree           – {catalogue: {category: [subcategories]}}, all in
+                       first-appearance order
+      catalogue_rows – {catalogue: ndarray of row positions} for iloc slicing
+      category_rows  – {(catalogue, category): ndarray of row positions}
+    """
+    by_catalogue = _products_df.groupby("Catalogue", sort=False, observed=True)
+    tree = {
+        catalogue: {
+            category: grp["Subcategory"].unique().tolist()
+            for category, grp in sub_df.groupby("Category", sort=False, observed=True)
+        }
+        for catalogue, sub_df in by_catalogue
+    }
+    category_rows = _products_df.groupby(
+        ["Catalogue", "Category"], sort=False, observed=True
+    ).indices
+    return tree, by_catalogue.indices, category_rows
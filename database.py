@@ -41,6 +41,7 @@ def get_empty_products_db():
 # =========================================================================
 
 _DB_CACHE_KEY = "_products_db_cache"
+_OVERRIDE_PIDS_KEY = "_override_pids_cache"
 
 
 def _load_from_disk_or_cloud():
@@ -105,6 +106,17 @@ def invalidate_db_cache():
     """Force reload from disk on next access."""
     if _DB_CACHE_KEY in st.session_state:
         del st.session_state[_DB_CACHE_KEY]
+    st.session_state.pop(_OVERRIDE_PIDS_KEY, None)
+
+
+def get_overridden_pids():
+    """ProductIDs that have saved field overrides, as a frozenset.
+    Cached in session state next to the DB; override writes drop it."""
+    if _OVERRIDE_PIDS_KEY not in st.session_state:
+        st.session_state[_OVERRIDE_PIDS_KEY] = frozenset(
+            load_products_db().get("product_overrides", {})
+        )
+    return st.session_state[_OVERRIDE_PIDS_KEY]
 
 
 # =========================================================================
@@ -117,6 +129,20 @@ def save_product_override(product_id, field_changes):
     if product_id not in db["product_overrides"]:
         db["product_overrides"][product_id] = {}
     db["product_overrides"][product_id].update(field_changes)
+    st.session_state.pop(_OVERRIDE_PIDS_KEY, None)
+    save_products_db(db)
+
+
+def save_product_overrides(changes_by_pid):
+    """Save field-level overrides for many products with a single DB write.
+    changes_by_pid = {ProductID: {field: value}}."""
+    if not changes_by_pid:
+        return
+    db = load_products_db()
+    overrides = db["product_overrides"]
+    for product_id, field_changes in changes_by_pid.items():
+        overrides.setdefault(product_id, {}).update(field_changes)
+    st.session_state.pop(_OVERRIDE_PIDS_KEY, None)
     save_products_db(db)
 
 
@@ -130,6 +156,7 @@ def remove_product_override(product_id, field_name=None):
                 del db["product_overrides"][product_id]
         else:
             del db["product_overrides"][product_id]
+    st.session_state.pop(_OVERRIDE_PIDS_KEY, None)
     save_products_db(db)
 
 
@@ -2,15 +2,15 @@
 HEM Product Catalogue v3 — Sidebar
 Renders: logo, template save/load/delete, data sync, database info.
 """
-import time
 import streamlit as st
 
 from database import (
     load_saved_templates, save_template_to_disk, delete_template,
     load_products_db,
 )
-from cart import clear_cart
+from cart import clear_cart, rebuild_cart_index, get_cart_categories
 from cloudinary_client import fetch_all_cloudinary_resources
+from data_loader import bump_data_version
 
 
 def render_sidebar() -> None:
@@ -26,7 +26,7 @@ def render_sidebar() -> None:
                             color:#f5a832;
                             letter-spacing:2px;">HEM EXPORTS</div>
                 <div style="font-size:10px;color:rgba(255,220,200,0.65);letter-spacing:3px;
-                            text-transform:uppercase;margin-top:2px;">Catalogue Manager</div>
+                            margin-top:2px;">CATALOGUE MANAGER</div>
             </div>
             <div class="gold-divider" style="margin:0 0 16px;"></div>
             """,
@@ -35,14 +35,14 @@ def render_sidebar() -> None:
 
         # ── Cart summary ──────────────────────────────────────────────────
         cart_count = len(st.session_state.cart)
-        cat_count  = len(set(i.get("Category", "") for i in st.session_state.cart))
+        cat_count  = len(get_cart_categories())
         st.markdown(
             f"""
             <div style="background:rgba(200,16,46,0.10);
                         border:1px solid rgba(200,16,46,0.25);border-radius:12px;
                         padding:14px 18px;margin-bottom:16px;text-align:center;">
-                <div style="font-size:11px;color:rgba(255,220,200,0.65);text-transform:uppercase;
-                             letter-spacing:1px;margin-bottom:6px;">Current Cart</div>
+                <div style="font-size:11px;color:rgba(255,220,200,0.65);
+                             letter-spacing:1px;margin-bottom:6px;">CURRENT CART</div>
                 <div style="font-size:28px;font-weight:700;color:#f5a832;
                              font-family:'Playfair Display',serif;">{cart_count}</div>
                 <div style="font-size:11px;color:rgba(255,220,200,0.55);">
@@ -57,7 +57,7 @@ def render_sidebar() -> None:
         st.markdown("### 🔄 Data Sync")
         if st.button("Refresh Cloudinary & Excel", use_container_width=True):
             st.cache_data.clear()
-            st.session_state.data_timestamp = time.time()
+            st.session_state.data_timestamp = bump_data_version()
             st.session_state.gen_pdf_bytes  = None
             st.session_state.gen_excel_bytes= None
             st.toast("Data refreshed!", icon="🔄")
@@ -98,6 +98,7 @@ def render_sidebar() -> None:
                             use_container_width=True,
                         ):
                             st.session_state.cart          = list(tpl_items)
+                            rebuild_cart_index()
                             st.session_state.gen_pdf_bytes = None
                             st.session_state.gen_excel_bytes = None
                             st.toast(f"Loaded '{tpl_name}'", icon="📂")
@@ -9,16 +9,43 @@ Authentic HEM Corporation light palette:
   Cards:     Pure White        #ffffff
   Dark text: Charcoal          #1a0a0a
 
-Injected via st.markdown(APP_CSS, unsafe_allow_html=True) in app.py.
+Split into CRITICAL_CSS (injected at the top of app.py) and DEFERRED_CSS
+(injected after the tabs). get_critical_css() / get_deferred_css() return
+them with rules for classes the app never emits removed.
+Google Fonts are loaded separately through FONT_LINKS (see below).
+"""
+import os
+import re
+from functools import lru_cache
+
+from config import BASE_DIR
+
+# ═══════════════════════════════════════════════════════════════════════════
+# GOOGLE FONTS — Cinzel for headings + Inter for body
+# Loaded via <link> tags instead of an @import inside <style>, so the browser
+# can discover the font stylesheet immediately and open the connection to
+# fonts.gstatic.com in parallel with CSS parsing.
+# ═══════════════════════════════════════════════════════════════════════════
+GOOGLE_FONTS_URL = (
+    "https://fonts.googleapis.com/css2"
+    "?family=Cinzel:wght@600;700;800;900"
+    "&family=Inter:wght@300;400;500;600;700"
+    "&display=swap"
+)
+
+FONT_LINKS = f"""
+<link rel="preconnect" href="https://fonts.googleapis.com">
+<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+<link rel="stylesheet" href="{GOOGLE_FONTS_URL}">
 """
 
-APP_CSS = """
+# ═══════════════════════════════════════════════════════════════════════════
+# CRITICAL CSS — above-the-fold chrome, injected first thing in app.py:
+# tokens, page base, title banner, tabs, buttons, sidebar, section headers,
+# stats bar and the responsive overrides for those.
+# ═══════════════════════════════════════════════════════════════════════════
+CRITICAL_CSS = """
 <style>
-/* ═══════════════════════════════════════════════════════════════════════════
-   GOOGLE FONTS — Cinzel for headings + Inter for body
-═══════════════════════════════════════════════════════════════════════════ */
-@import url('https://fonts.googleapis.com/css2?family=Cinzel:wght@600;700;800;900&family=Inter:wght@300;400;500;600;700&display=swap');
-
 /* ═══════════════════════════════════════════════════════════════════════════
    CSS DESIGN TOKENS — HEM Brand (Light Mode)
 ═══════════════════════════════════════════════════════════════════════════ */
@@ -68,6 +95,17 @@ APP_CSS = """
     --shadow-lg:   0 8px 32px rgba(200,16,46,0.12), 0 4px 16px rgba(0,0,0,0.08);
     --shadow-red:  0 4px 20px rgba(200,16,46,0.25);
 
+    /* ── Component shadow tokens (shared strings → shared paint records) ── */
+    --shadow-red-sm:        0 2px 8px rgba(200,16,46,0.40);
+    --shadow-red-pulse:     0 0 8px rgba(200,16,46,0.50);
+    --shadow-red-btn:       0 4px 14px rgba(200,16,46,0.30), inset 0 1px 0 rgba(255,255,255,0.15);
+    --shadow-red-btn-hover: 0 6px 22px rgba(200,16,46,0.40), inset 0 1px 0 rgba(255,255,255,0.20);
+    --shadow-saffron-sm:    0 3px 12px rgba(232,135,10,0.20);
+    --shadow-saffron-glow:  0 0 14px rgba(232,135,10,0.22);
+    --shadow-gold-sm:       0 3px 14px rgba(253,188,0,0.25);
+    --shadow-sidebar:       4px 0 24px rgba(200,16,46,0.15);
+    --shadow-inset-line:    0 0 0 1px rgba(255,255,255,0.08) inset;
+
     /* ── Radius ── */
     --r-sm:  6px;
     --r-md:  12px;
@@ -85,7 +123,7 @@ APP_CSS = """
 *, *::before, *::after { box-sizing: border-box; }
 
 .stApp {
-    background: var(--bg-page) !important;
+    background: #fef7f2 !important;   /* was the #fff9f5→#fdf4ee radial layer, ΔE≈2 */
     color: var(--text-body) !important;
     font-family: 'Inter', sans-serif;
 }
@@ -96,20 +134,6 @@ APP_CSS = """
     max-width: 1440px;
 }
 
-/* Subtle warm gradient background */
-.stApp::before {
-    content: '';
-    position: fixed;
-    top: 0; left: 0;
-    width: 100%; height: 100%;
-    background:
-        radial-gradient(ellipse 60% 40% at 10% 5%,  rgba(200,16,46,0.04) 0%, transparent 60%),
-        radial-gradient(ellipse 50% 35% at 90% 90%, rgba(232,135,10,0.03) 0%, transparent 60%),
-        radial-gradient(ellipse 100% 100% at 50% 50%, #fff9f5 0%, #fdf4ee 100%);
-    z-index: -1;
-    pointer-events: none;
-}
-
 /* ═══════════════════════════════════════════════════════════════════════════
    MAIN TITLE BANNER
 ═══════════════════════════════════════════════════════════════════════════ */
@@ -126,7 +150,7 @@ APP_CSS = """
     text-align: center;
     position: relative;
     overflow: hidden;
-    box-shadow: var(--shadow-lg), 0 0 0 1px rgba(255,255,255,0.08) inset;
+    box-shadow: var(--shadow-lg), var(--shadow-inset-line);
 }
 
 /* Saffron shimmer sweep */
@@ -168,7 +192,6 @@ APP_CSS = """
     font-size: 46px;
     font-weight: 900;
     letter-spacing: 10px;
-    text-transform: uppercase;
     background: linear-gradient(135deg,
         #ffd84d 0%,
         #fdbc00 25%,
@@ -189,7 +212,6 @@ APP_CSS = """
     font-size: 11px;
     font-weight: 500;
     letter-spacing: 5px;
-    text-transform: uppercase;
     color: rgba(255,220,200,0.80);
     display: block;
     margin-top: 4px;
@@ -215,7 +237,8 @@ APP_CSS = """
     color: var(--text-mid) !important;
     background: transparent !important;
     border: 1px solid transparent !important;
-    transition: all var(--t-normal);
+    transition: color var(--t-normal), background-color var(--t-normal),
+                border-color var(--t-normal), box-shadow var(--t-normal);
     letter-spacing: 0.2px;
     font-family: 'Inter', sans-serif;
 }
@@ -257,9 +280,8 @@ button[kind="primary"],
     text-transform: uppercase !important;
     border-radius: 8px !important;
     padding: 10px 22px !important;
-    box-shadow: 0 4px 14px rgba(200,16,46,0.30),
-                inset 0 1px 0 rgba(255,255,255,0.15) !important;
-    transition: all var(--t-normal) !important;
+    box-shadow: var(--shadow-red-btn) !important;
+    transition: box-shadow var(--t-normal), transform var(--t-normal) !important;
     position: relative;
     overflow: hidden;
 }
@@ -272,8 +294,7 @@ button[kind="primary"]::before {
 }
 button[kind="primary"]:hover::before { left: 100%; }
 button[kind="primary"]:hover {
-    box-shadow: 0 6px 22px rgba(200,16,46,0.40),
-                inset 0 1px 0 rgba(255,255,255,0.20) !important;
+    box-shadow: var(--shadow-red-btn-hover) !important;
     transform: translateY(-2px) !important;
 }
 button[kind="primary"]:active { transform: translateY(0) !important; }
@@ -289,12 +310,13 @@ button[kind="secondary"],
     letter-spacing: 0.8px !important;
     text-transform: uppercase !important;
     border-radius: 8px !important;
-    transition: all var(--t-normal) !important;
+    transition: background-color var(--t-normal), border-color var(--t-normal),
+                box-shadow var(--t-normal), transform var(--t-normal) !important;
 }
 button[kind="secondary"]:hover {
     background: rgba(232,135,10,0.12) !important;
     border-color: var(--saffron) !important;
-    box-shadow: 0 3px 12px rgba(232,135,10,0.20) !important;
+    box-shadow: var(--shadow-saffron-sm) !important;
     transform: translateY(-1px) !important;
 }
 
@@ -306,7 +328,8 @@ button[kind="tertiary"],
     border: 1px solid var(--border-light) !important;
     font-weight: 500 !important;
     border-radius: 8px !important;
-    transition: all var(--t-fast) !important;
+    transition: background-color var(--t-fast), color var(--t-fast),
+                border-color var(--t-fast) !important;
     font-size: 12px !important;
 }
 button[kind="tertiary"]:hover {
@@ -317,9 +340,7 @@ button[kind="tertiary"]:hover {
 
 /* ── Download button — Gold ── */
 [data-testid="stDownloadButton"] button {
-    background: linear-gradient(135deg,
-        var(--gold-pale),
-        rgba(253,188,0,0.12)) !important;
+    background: #fff9e3 !important;   /* was gold-pale → 12% gold, ΔE≈2 */
     color: var(--gold-dark) !important;
     border: 1px solid var(--border-gold) !important;
     font-weight: 700 !important;
@@ -327,68 +348,15 @@ button[kind="tertiary"]:hover {
     text-transform: uppercase !important;
     font-size: 12px !important;
     border-radius: 8px !important;
-    transition: all var(--t-normal) !important;
+    transition: background-color var(--t-normal), box-shadow var(--t-normal),
+                transform var(--t-normal) !important;
 }
 [data-testid="stDownloadButton"] button:hover {
     background: rgba(253,188,0,0.20) !important;
-    box-shadow: 0 3px 14px rgba(253,188,0,0.25) !important;
+    box-shadow: var(--shadow-gold-sm) !important;
     transform: translateY(-1px) !important;
 }
 
-/* ═══════════════════════════════════════════════════════════════════════════
-   INPUT FIELDS
-═══════════════════════════════════════════════════════════════════════════ */
-.stTextInput input,
-.stTextInput textarea {
-    background: var(--bg-card) !important;
-    color: var(--text-dark) !important;
-    border: 1px solid var(--border-medium) !important;
-    border-radius: var(--r-md) !important;
-    padding: 10px 14px !important;
-    font-size: 14px !important;
-    transition: border-color var(--t-fast), box-shadow var(--t-fast) !important;
-    box-shadow: var(--shadow-sm) !important;
-}
-.stTextInput input::placeholder { color: var(--text-muted) !important; }
-.stTextInput input:focus {
-    border-color: var(--hem-red) !important;
-    box-shadow: 0 0 0 3px var(--hem-red-glow), var(--shadow-sm) !important;
-    outline: none !important;
-}
-
-/* Selectbox */
-.stSelectbox > div > div {
-    background: var(--bg-card) !important;
-    border: 1px solid var(--border-medium) !important;
-    border-radius: var(--r-md) !important;
-    color: var(--text-dark) !important;
-    box-shadow: var(--shadow-sm) !important;
-    transition: border-color var(--t-fast) !important;
-}
-.stSelectbox > div > div:focus-within {
-    border-color: var(--hem-red) !important;
-    box-shadow: 0 0 0 3px var(--hem-red-glow), var(--shadow-sm) !important;
-}
-
-/* Multiselect */
-.stMultiSelect > div > div {
-    background: var(--bg-card) !important;
-    border: 1px solid var(--border-medium) !important;
-    border-radius: var(--r-md) !important;
-    box-shadow: var(--shadow-sm) !important;
-}
-.stMultiSelect > div > div:focus-within {
-    border-color: var(--hem-red) !important;
-    box-shadow: 0 0 0 3px var(--hem-red-glow) !important;
-}
-/* Chips */
-[data-baseweb="tag"] {
-    background: var(--hem-red-pale) !important;
-    border: 1px solid var(--border-red) !important;
-    color: var(--hem-red) !important;
-    border-radius: 6px !important;
-}
-
 /* ═══════════════════════════════════════════════════════════════════════════
    SIDEBAR — Deep HEM red dark (brand contrast)
 ═══════════════════════════════════════════════════════════════════════════ */
@@ -399,7 +367,7 @@ section[data-testid="stSidebar"] {
         #1a0508 80%,
         #110305 100%) !important;
     border-right: 2px solid var(--hem-red) !important;
-    box-shadow: 4px 0 24px rgba(200,16,46,0.15);
+    box-shadow: var(--shadow-sidebar);
 }
 section[data-testid="stSidebar"] > div { padding-top: 1.5rem; }
 
@@ -441,7 +409,7 @@ section[data-testid="stSidebar"] button {
 }
 section[data-testid="stSidebar"] button:hover {
     background: rgba(232,135,10,0.28) !important;
-    box-shadow: 0 0 14px rgba(232,135,10,0.22) !important;
+    box-shadow: var(--shadow-saffron-glow) !important;
 }
 
 /* Sidebar expanders */
@@ -455,33 +423,6 @@ section[data-testid="stSidebar"] .streamlit-expanderHeader:hover {
     background: rgba(200,16,46,0.12) !important;
 }
 
-/* ═══════════════════════════════════════════════════════════════════════════
-   EXPANDERS
-═══════════════════════════════════════════════════════════════════════════ */
-.streamlit-expanderHeader {
-    background: var(--bg-card) !important;
-    color: var(--text-body) !important;
-    border: 1px solid var(--border-light) !important;
-    border-radius: var(--r-md) !important;
-    padding: 12px 18px !important;
-    font-weight: 600 !important;
-    font-size: 14px !important;
-    transition: all var(--t-fast) !important;
-    box-shadow: var(--shadow-sm) !important;
-}
-.streamlit-expanderHeader:hover {
-    border-color: var(--border-red) !important;
-    color: var(--hem-red) !important;
-    background: var(--hem-red-pale) !important;
-}
-.streamlit-expanderContent {
-    background: var(--bg-card-warm) !important;
-    border: 1px solid var(--border-light) !important;
-    border-top: none !important;
-    border-radius: 0 0 var(--r-md) var(--r-md) !important;
-    padding: 12px 18px 16px !important;
-}
-
 /* ═══════════════════════════════════════════════════════════════════════════
    SECTION HEADERS
 ═══════════════════════════════════════════════════════════════════════════ */
@@ -516,37 +457,6 @@ section[data-testid="stSidebar"] .streamlit-expanderHeader:hover {
     opacity: 0.6;
 }
 
-/* ═══════════════════════════════════════════════════════════════════════════
-   GLASS CARD → Clean white card
-═══════════════════════════════════════════════════════════════════════════ */
-.glass-card {
-    background: var(--bg-card);
-    border: 1px solid var(--border-light);
-    border-radius: var(--r-xl);
-    padding: 24px 28px;
-    box-shadow: var(--shadow-md);
-    margin: 12px 0;
-    transition: border-color var(--t-normal), box-shadow var(--t-normal);
-    position: relative;
-    overflow: hidden;
-}
-.glass-card::before {
-    content: '';
-    position: absolute;
-    top: 0; left: 0; right: 0; height: 3px;
-    background: linear-gradient(90deg,
-        var(--hem-red),
-        var(--saffron),
-        var(--gold),
-        var(--saffron),
-        var(--hem-red));
-    border-radius: var(--r-xl) var(--r-xl) 0 0;
-}
-.glass-card:hover {
-    border-color: var(--border-red);
-    box-shadow: var(--shadow-lg);
-}
-
 /* ═══════════════════════════════════════════════════════════════════════════
    STATS BAR
 ═══════════════════════════════════════════════════════════════════════════ */
@@ -568,7 +478,6 @@ section[data-testid="stSidebar"] .streamlit-expanderHeader:hover {
     color: var(--text-muted);
     font-weight: 500;
     letter-spacing: 0.3px;
-    text-transform: uppercase;
 }
 .stat-value {
     font-size: 18px;
@@ -580,6 +489,159 @@ section[data-testid="stSidebar"] .streamlit-expanderHeader:hover {
     margin-top: 2px;
 }
 
+/* ═══════════════════════════════════════════════════════════════════════════
+   RESPONSIVE
+═══════════════════════════════════════════════════════════════════════════ */
+@media (max-width: 768px) {
+    .main-title .title-brand { font-size: 28px; letter-spacing: 4px; }
+    .main-title { padding: 24px 20px 18px; }
+    .stats-bar { flex-direction: column; gap: 10px; }
+    .section-header { font-size: 16px; padding: 12px 18px; }
+}
+
+/* ═══════════════════════════════════════════════════════════════════════════
+   LIGHTWEIGHT MODE — small screens & data-saver
+   Flattens gradients to solid brand colours and stops infinite animations:
+   fewer raster layers and no per-frame repaints on low-end GPUs.
+═══════════════════════════════════════════════════════════════════════════ */
+@media (max-width: 768px), (prefers-reduced-data: reduce) {
+    .main-title { background: var(--hem-red-deep); }
+    .main-title::before { animation: none; display: none; }
+    .main-title .title-brand {
+        background: none;
+        -webkit-text-fill-color: var(--gold);
+        color: var(--gold);
+        filter: none;
+    }
+    .section-header { background: var(--hem-red-pale); }
+    button[kind="primary"],
+    .stButton button[kind="primary"] { background: var(--hem-red) !important; }
+    button[kind="primary"]::before { display: none; }
+    section[data-testid="stSidebar"] { background: var(--bg-sidebar) !important; }
+}
+</style>
+"""
+
+# ═══════════════════════════════════════════════════════════════════════════
+# DEFERRED CSS — inputs, expanders, badges, dialogs, data editor, progress
+# bar, toasts, empty states… Injected after the tabs have rendered so it never
+# sits in front of the first paint of the header.
+# ═══════════════════════════════════════════════════════════════════════════
+DEFERRED_CSS = """
+<style>
+/* ═══════════════════════════════════════════════════════════════════════════
+   INPUT FIELDS
+═══════════════════════════════════════════════════════════════════════════ */
+.stTextInput input,
+.stTextInput textarea {
+    background: var(--bg-card) !important;
+    color: var(--text-dark) !important;
+    border: 1px solid var(--border-medium) !important;
+    border-radius: var(--r-md) !important;
+    padding: 10px 14px !important;
+    font-size: 14px !important;
+    transition: border-color var(--t-fast), box-shadow var(--t-fast) !important;
+    box-shadow: var(--shadow-sm) !important;
+}
+.stTextInput input::placeholder { color: var(--text-muted) !important; }
+.stTextInput input:focus {
+    border-color: var(--hem-red) !important;
+    box-shadow: 0 0 0 3px var(--hem-red-glow), var(--shadow-sm) !important;
+    outline: none !important;
+}
+
+/* Selectbox */
+.stSelectbox > div > div {
+    background: var(--bg-card) !important;
+    border: 1px solid var(--border-medium) !important;
+    border-radius: var(--r-md) !important;
+    color: var(--text-dark) !important;
+    box-shadow: var(--shadow-sm) !important;
+    transition: border-color var(--t-fast) !important;
+}
+.stSelectbox > div > div:focus-within {
+    border-color: var(--hem-red) !important;
+    box-shadow: 0 0 0 3px var(--hem-red-glow), var(--shadow-sm) !important;
+}
+
+/* Multiselect */
+.stMultiSelect > div > div {
+    background: var(--bg-card) !important;
+    border: 1px solid var(--border-medium) !important;
+    border-radius: var(--r-md) !important;
+    box-shadow: var(--shadow-sm) !important;
+}
+.stMultiSelect > div > div:focus-within {
+    border-color: var(--hem-red) !important;
+    box-shadow: 0 0 0 3px var(--hem-red-glow) !important;
+}
+/* Chips */
+[data-baseweb="tag"] {
+    background: var(--hem-red-pale) !important;
+    border: 1px solid var(--border-red) !important;
+    color: var(--hem-red) !important;
+    border-radius: 6px !important;
+}
+
+/* ═══════════════════════════════════════════════════════════════════════════
+   EXPANDERS
+═══════════════════════════════════════════════════════════════════════════ */
+.streamlit-expanderHeader {
+    background: var(--bg-card) !important;
+    color: var(--text-body) !important;
+    border: 1px solid var(--border-light) !important;
+    border-radius: var(--r-md) !important;
+    padding: 12px 18px !important;
+    font-weight: 600 !important;
+    font-size: 14px !important;
+    transition: background-color var(--t-fast), color var(--t-fast),
+                border-color var(--t-fast) !important;
+    box-shadow: var(--shadow-sm) !important;
+}
+.streamlit-expanderHeader:hover {
+    border-color: var(--border-red) !important;
+    color: var(--hem-red) !important;
+    background: var(--hem-red-pale) !important;
+}
+.streamlit-expanderContent {
+    background: var(--bg-card-warm) !important;
+    border: 1px solid var(--border-light) !important;
+    border-top: none !important;
+    border-radius: 0 0 var(--r-md) var(--r-md) !important;
+    padding: 12px 18px 16px !important;
+}
+
+/* ═══════════════════════════════════════════════════════════════════════════
+   GLASS CARD → Clean white card
+═══════════════════════════════════════════════════════════════════════════ */
+.glass-card {
+    background: var(--bg-card);
+    border: 1px solid var(--border-light);
+    border-radius: var(--r-xl);
+    padding: 24px 28px;
+    box-shadow: var(--shadow-md);
+    margin: 12px 0;
+    transition: border-color var(--t-normal), box-shadow var(--t-normal);
+    position: relative;
+    overflow: hidden;
+}
+.glass-card::before {
+    content: '';
+    position: absolute;
+    top: 0; left: 0; right: 0; height: 3px;
+    background: linear-gradient(90deg,
+        var(--hem-red),
+        var(--saffron),
+        var(--gold),
+        var(--saffron),
+        var(--hem-red));
+    border-radius: var(--r-xl) var(--r-xl) 0 0;
+}
+.glass-card:hover {
+    border-color: var(--border-red);
+    box-shadow: var(--shadow-lg);
+}
+
 /* ═══════════════════════════════════════════════════════════════════════════
    PRODUCT BADGES
 ═══════════════════════════════════════════════════════════════════════════ */
@@ -592,14 +654,13 @@ section[data-testid="stSidebar"] .streamlit-expanderHeader:hover {
     padding: 2px 8px;
     border-radius: 10px;
     margin-left: 6px;
-    text-transform: uppercase;
     letter-spacing: 0.8px;
     animation: badge-pulse 2s ease-in-out infinite;
     vertical-align: middle;
 }
 @keyframes badge-pulse {
     0%, 100% { opacity: 1; }
-    50%       { opacity: 0.75; box-shadow: 0 0 8px rgba(200,16,46,0.50); }
+    50%       { opacity: 0.75; box-shadow: var(--shadow-red-pulse); }
 }
 
 .badge-modified {
@@ -609,7 +670,7 @@ section[data-testid="stSidebar"] .streamlit-expanderHeader:hover {
     font-size: 9px; font-weight: 800;
     padding: 2px 8px; border-radius: 10px;
     border: 1px solid var(--border-saffron);
-    margin-left: 6px; text-transform: uppercase; letter-spacing: 0.8px;
+    margin-left: 6px; letter-spacing: 0.8px;
     vertical-align: middle;
 }
 
@@ -620,7 +681,7 @@ section[data-testid="stSidebar"] .streamlit-expanderHeader:hover {
     font-size: 9px; font-weight: 800;
     padding: 2px 8px; border-radius: 10px;
     border: 1px solid var(--border-gold);
-    margin-left: 6px; text-transform: uppercase; letter-spacing: 0.8px;
+    margin-left: 6px; letter-spacing: 0.8px;
     vertical-align: middle;
 }
 
@@ -630,7 +691,7 @@ section[data-testid="stSidebar"] .streamlit-expanderHeader:hover {
     color: #ffffff;
     font-size: 9px; font-weight: 800;
     padding: 2px 8px; border-radius: 10px;
-    margin-left: 6px; text-transform: uppercase; letter-spacing: 0.8px;
+    margin-left: 6px; letter-spacing: 0.8px;
     vertical-align: middle;
 }
 
@@ -647,25 +708,6 @@ section[data-testid="stSidebar"] .streamlit-expanderHeader:hover {
     font-weight: 700;
     color: var(--saffron);
     letter-spacing: 0.8px;
-    text-transform: uppercase;
-}
-
-/* ═══════════════════════════════════════════════════════════════════════════
-   PRODUCT THUMBNAIL
-═══════════════════════════════════════════════════════════════════════════ */
-.product-thumb {
-    border-radius: var(--r-sm);
-    border: 1px solid var(--border-red);
-    object-fit: cover;
-    background: var(--bg-cream);
-    box-shadow: var(--shadow-sm);
-}
-.product-thumb-placeholder {
-    border-radius: var(--r-sm);
-    border: 1px dashed var(--border-medium);
-    background: var(--bg-cream);
-    display: flex; align-items: center; justify-content: center;
-    font-size: 10px; color: var(--text-muted);
 }
 
 /* ═══════════════════════════════════════════════════════════════════════════
@@ -731,7 +773,8 @@ div[data-testid="stDataEditor"] thead th {
     border-radius: var(--r-lg);
     padding: 18px 22px;
     box-shadow: var(--shadow-sm);
-    transition: all var(--t-normal);
+    transition: border-color var(--t-normal), box-shadow var(--t-normal),
+                transform var(--t-normal);
     position: relative;
     overflow: hidden;
 }
@@ -905,18 +948,120 @@ hr::after {
     border-radius: 11px;
     padding: 0 7px;
     margin-left: 8px;
-    box-shadow: 0 2px 8px rgba(200,16,46,0.40);
+    box-shadow: var(--shadow-red-sm);
     letter-spacing: 0.5px;
 }
 
 /* ═══════════════════════════════════════════════════════════════════════════
-   RESPONSIVE
+   LIGHTWEIGHT MODE — deferred components (see CRITICAL_CSS)
 ═══════════════════════════════════════════════════════════════════════════ */
-@media (max-width: 768px) {
-    .main-title .title-brand { font-size: 28px; letter-spacing: 4px; }
-    .main-title { padding: 24px 20px 18px; }
-    .stats-bar { flex-direction: column; gap: 10px; }
-    .section-header { font-size: 16px; padding: 12px 18px; }
+@media (max-width: 768px), (prefers-reduced-data: reduce) {
+    .badge-new { animation: none; }
+    .badge-in-cart { background: var(--hem-red); }
 }
 </style>
 """
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TREE-SHAKING
+# Drops rules whose selectors reference app classes that no Python module
+# ever renders, so only live CSS is shipped over the websocket.
+# ═══════════════════════════════════════════════════════════════════════════
+_COMMENT_RE        = re.compile(r"/\*.*?\*/", re.S)
+_SELECTOR_CLASS_RE = re.compile(r"\.(-?[_a-zA-Z][\w-]*)")
+_SOURCE_TOKEN_RE   = re.compile(r"[A-Za-z_][\w-]*")
+# Classes owned by Streamlit itself — never referenced from our sources.
+_FRAMEWORK_CLASS_RE = re.compile(r"^(st[A-Z]|streamlit-|main$|block-container$)")
+# At-rules whose body is a list of rules (recurse) rather than declarations.
+_NESTED_AT_RULES   = ("@media", "@supports")
+
+
+@lru_cache(maxsize=1)
+def _scan_used_classes() -> frozenset:
+    """Collect every identifier-like token from the app's Python sources."""
+    tokens = set()
+    for root, dirs, files in os.walk(BASE_DIR):
+        dirs[:] = [d for d in dirs if not d.startswith((".", "__")) and d != "venv"]
+        for name in files:
+            if not name.endswith(".py") or name == "styles.py":
+                continue
+            try:
+                with open(os.path.join(root, name), encoding="utf-8") as f:
+                    tokens.update(_SOURCE_TOKEN_RE.findall(f.read()))
+            except OSError:
+                continue
+    return frozenset(tokens)
+
+
+def _selector_is_used(selector: str, used: frozenset) -> bool:
+    """True if every app-defined class in the selector is rendered somewhere."""
+    return all(
+        cls in used or _FRAMEWORK_CLASS_RE.match(cls)
+        for cls in _SELECTOR_CLASS_RE.findall(selector)
+    )
+
+
+def _matching_brace(css: str, open_idx: int) -> int:
+    """Index of the '}' that closes the '{' at open_idx."""
+    depth = 0
+    for i in range(open_idx, len(css)):
+        if css[i] == "{":
+            depth += 1
+        elif css[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(css) - 1
+
+
+def _treeshake(css: str, used: frozenset) -> str:
+    """Return css with unused selectors (and rules left empty) removed."""
+    out = []
+    pos = 0
+    while True:
+        open_idx = css.find("{", pos)
+        if open_idx == -1:
+            break
+        close_idx = _matching_brace(css, open_idx)
+        prelude   = css[pos:open_idx].strip()
+        body      = css[open_idx + 1:close_idx]
+        pos       = close_idx + 1
+
+        if prelude.startswith(_NESTED_AT_RULES):
+            inner = _treeshake(body, used)
+            if inner:
+                out.append(f"{prelude} {{\n{inner}\n}}")
+        elif prelude.startswith("@"):
+            out.append(f"{prelude} {{{body}}}")
+        else:
+            selectors = [
+                sel.strip() for sel in prelude.split(",")
+                if _selector_is_used(sel, used)
+            ]
+            if selectors:
+                out.append(f"{', '.join(selectors)} {{{body}}}")
+    return "\n".join(out)
+
+
+@lru_cache(maxsize=None)
+def _shake_block(style_block: str) -> str:
+    """Tree-shake one <style> block (tags and comments stripped), once per process."""
+    css = style_block.replace("<style>", "").replace("</style>", "")
+    css = _COMMENT_RE.sub("", css)
+    return _treeshake(css, _scan_used_classes())
+
+
+def get_critical_css() -> str:
+    """Tree-shaken CRITICAL_CSS as an inline <style> — inject before anything else renders."""
+    return f"<style>\n{_shake_block(CRITICAL_CSS)}\n</style>"
+
+
+def get_deferred_css() -> str:
+    """Tree-shaken DEFERRED_CSS as an inline <style> — inject after the tabs.
+
+    Kept inline rather than linked from app/static/: Streamlit's static
+    mount serves .css as text/plain with nosniff, so browsers would not
+    apply it.
+    """
+    return f"<style>\n{_shake_block(DEFERRED_CSS)}\n</style>"
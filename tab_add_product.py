@@ -3,15 +3,18 @@ HEM Product Catalogue v3 — Tab 4: Add Product
 Custom product creation, management, and admin tools
 (override reset, hidden product restore).
 """
-import time
 import streamlit as st
 
 from config import CATALOGUE_PATHS
+from data_loader import build_search_index, build_taxonomy, bump_data_version
 from database import (
     load_products_db, add_custom_item, delete_custom_item,
     get_custom_products_from_db, remove_product_override, unmark_product_deleted,
 )
-from ui.components import section_header, confirm_action, gold_divider, empty_state
+from ui.components import section_header, confirm_action, gold_divider, empty_state, paginate
+
+# Rows per page in the admin lists — keeps widget count per rerun constant
+ADMIN_PAGE_SIZE = 20
 
 
 def render_add_product_tab(products_df) -> None:
@@ -37,11 +40,10 @@ def render_add_product_tab(products_df) -> None:
             new_catalogue = st.selectbox("📚 Catalogue *", existing_catalogues)
 
             # Dynamic existing categories for chosen catalogue
+            # (read from the cached taxonomy — no per-render mask + unique pass)
             if not products_df.empty:
-                existing_cats = (
-                    products_df[products_df["Catalogue"] == new_catalogue]["Category"]
-                    .unique().tolist()
-                )
+                taxonomy, _, _ = build_taxonomy(products_df, st.session_state.data_timestamp)
+                existing_cats  = list(taxonomy.get(new_catalogue, {}))
             else:
                 existing_cats = []
 
@@ -104,9 +106,10 @@ def render_add_product_tab(products_df) -> None:
             if not errors:
                 # Duplicate check
                 if not products_df.empty:
+                    idx = build_search_index(products_df, st.session_state.data_timestamp)
                     dup = (
-                        (products_df["ItemName"].str.lower()  == new_item_name.lower()) &
-                        (products_df["Category"].str.lower()  == new_category.lower()) &
+                        (idx["name_lc"]                       == new_item_name.lower()) &
+                        (idx["cat_lc"]                        == new_category.lower()) &
                         (products_df["Catalogue"]             == new_catalogue)
                     )
                     if dup.any():
@@ -147,7 +150,8 @@ def render_add_product_tab(products_df) -> None:
             f'{len(custom_items)} custom product(s) in database.</div>',
             unsafe_allow_html=True,
         )
-        for i, item in enumerate(custom_items):
+        page = paginate(len(custom_items), "admin_custom", ADMIN_PAGE_SIZE)
+        for i, item in enumerate(custom_items[page], start=page.start):
             c_info, c_del = st.columns([6, 1])
             with c_info:
                 new_tag = (
@@ -168,8 +172,7 @@ def render_add_product_tab(products_df) -> None:
                     danger=True,
                 ):
                     delete_custom_item(item["ProductID"])
-                    st.session_state.data_timestamp = time.time()
-                    st.cache_data.clear()
+                    st.session_state.data_timestamp = bump_data_version()
                     st.toast(f"Deleted '{item['ItemName']}'", icon="🗑️")
                     st.rerun()
     else:
@@ -191,7 +194,8 @@ def render_add_product_tab(products_df) -> None:
             f'{len(overrides)} product(s) have been edited.</div>',
             unsafe_allow_html=True,
         )
-        for pid, changes in overrides.items():
+        page = paginate(len(overrides), "admin_overrides", ADMIN_PAGE_SIZE)
+        for pid, changes in list(overrides.items())[page]:
             change_str = " · ".join(f"**{k}**: `{v}`" for k, v in changes.items())
             c_info, c_reset = st.columns([6, 1])
             with c_info:
@@ -203,8 +207,7 @@ def render_add_product_tab(products_df) -> None:
             with c_reset:
                 if st.button("↩ Reset", key=f"reset_{pid}", use_container_width=True):
                     remove_product_override(pid)
-                    st.session_state.data_timestamp = time.time()
-                    st.cache_data.clear()
+                    st.session_state.data_timestamp = bump_data_version()
                     st.toast(f"Reset edits for {pid}", icon="↩️")
                     st.rerun()
     else:
@@ -225,7 +228,8 @@ def render_add_product_tab(products_df) -> None:
             f'{len(deleted_pids)} product(s) are hidden from the catalogue.</div>',
             unsafe_allow_html=True,
         )
-        for pid in deleted_pids:
+        page = paginate(len(deleted_pids), "admin_hidden", ADMIN_PAGE_SIZE)
+        for pid in deleted_pids[page]:
             c_info, c_restore = st.columns([6, 1])
             with c_info:
                 st.markdown(
@@ -235,8 +239,7 @@ def render_add_product_tab(products_df) -> None:
             with c_restore:
                 if st.button("↩ Restore", key=f"restore_{pid}", use_container_width=True):
                     unmark_product_deleted(pid)
-                    st.session_state.data_timestamp = time.time()
-                    st.cache_data.clear()
+                    st.session_state.data_timestamp = bump_data_version()
                     st.toast(f"Restored {pid}", icon="✅")
                     st.rerun()
     else:
@@ -6,18 +6,55 @@ import os
 import json
 import logging
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
 from config import BASE_DIR, LOGO_PATH, CASE_SIZE_PATH
 from cloudinary_client import get_image_as_base64_str
-from data_loader import load_data_cached
+from cart import get_cart_categories, get_cart_df
 from pdf_generator import generate_pdf_html, generate_excel_file, render_pdf
 from ui.components import section_header, gold_divider, empty_state
 
 logger = logging.getLogger(__name__)
 
 
+@st.cache_data(show_spinner="Loading case sizes…", ttl=3600, max_entries=4)
+def _load_case_sizes(data_timestamp):
+    """
+    Load the case-size table and resolve its suffix / CBM columns.
+
+    Reads data/database.json first, then falls back to the GitHub Excel.
+    Cached per data_timestamp (and for at most an hour), so the Excel is
+    not re-downloaded and re-parsed on every rerun of the Export tab.
+    Excel errors propagate (and are therefore not cached).
+
+    Returns (case_df, suffix_col or None, cbm_col).
+    """
+    full_case_df = pd.DataFrame()
+    local_db     = os.path.join(BASE_DIR, "data", "database.json")
+    if os.path.exists(local_db):
+        try:
+            with open(local_db) as f:
+                raw = json.load(f)
+            if raw.get("case_sizes"):
+                full_case_df = pd.DataFrame(raw["case_sizes"])
+        except Exception:
+            pass
+
+    if full_case_df.empty:
+        full_case_df = pd.read_excel(CASE_SIZE_PATH, dtype=str)
+        full_case_df.columns = [c.strip() for c in full_case_df.columns]
+
+    suffix_col = next(
+        (c for c in full_case_df.columns if "suffix" in c.lower()), None
+    )
+    cbm_col = next(
+        (c for c in full_case_df.columns if "cbm" in c.lower()), "CBM"
+    )
+    return full_case_df, suffix_col, cbm_col
+
+
 def render_export_tab(products_df: pd.DataFrame) -> None:
     """Render Tab 3 — Export Catalogue."""
     section_header("Export Catalogue", icon="📄")
@@ -34,37 +71,20 @@ def render_export_tab(products_df: pd.DataFrame) -> None:
         unsafe_allow_html=True,
     )
 
-    cart_categories = sorted({item["Category"] for item in st.session_state.cart})
-
-    # Load case-size data (from local DB first, then GitHub Excel)
-    full_case_df = pd.DataFrame()
-    local_db     = os.path.join(BASE_DIR, "data", "database.json")
-    if os.path.exists(local_db):
-        try:
-            with open(local_db) as f:
-                raw = json.load(f)
-            if raw.get("case_sizes"):
-                full_case_df = pd.DataFrame(raw["case_sizes"])
-        except Exception:
-            pass
+    cart_categories = get_cart_categories()
 
-    if full_case_df.empty:
-        try:
-            full_case_df = pd.read_excel(CASE_SIZE_PATH, dtype=str)
-            full_case_df.columns = [c.strip() for c in full_case_df.columns]
-        except Exception as e:
-            st.error(f"Could not load Case Size data: {e}")
+    # Load case-size data (cached; local DB first, then GitHub Excel)
+    try:
+        full_case_df, suffix_col, cbm_col = _load_case_sizes(
+            st.session_state.data_timestamp
+        )
+    except Exception as e:
+        st.error(f"Could not load Case Size data: {e}")
+        full_case_df, suffix_col, cbm_col = pd.DataFrame(), None, "CBM"
 
     selection_map: dict = {}
 
     if not full_case_df.empty:
-        suffix_col = next(
-            (c for c in full_case_df.columns if "suffix" in c.lower()), None
-        )
-        cbm_col = next(
-            (c for c in full_case_df.columns if "cbm" in c.lower()), "CBM"
-        )
-
         if not suffix_col:
             st.error(
                 f"Cannot find 'Carton Suffix' column in Case Size file. "
@@ -84,13 +104,12 @@ def render_export_tab(products_df: pd.DataFrame) -> None:
                             full_case_df["Category"] == cat
                         ].copy()
                         if not options.empty:
-                            options["_label"] = options.apply(
-                                lambda x: (
-                                    f"{x.get(suffix_col, '').strip()} "
-                                    f"(CBM: {x.get(cbm_col, '')})"
-                                ),
-                                axis=1,
+                            suffix = options[suffix_col].fillna("").astype(str).str.strip()
+                            cbm    = (
+                                options[cbm_col].fillna("").astype(str)
+                                if cbm_col in options.columns else ""
                             )
+                            options["_label"] = suffix + " (CBM: " + cbm + ")"
                             chosen = st.selectbox(
                                 f"📦 **{cat}**",
                                 options["_label"].tolist(),
@@ -125,7 +144,7 @@ def render_export_tab(products_df: pd.DataFrame) -> None:
     if st.session_state.gen_pdf_bytes or st.session_state.gen_excel_bytes:
         st.markdown(
             '<div style="font-size:13px;color:#c8102e;margin-bottom:10px;'
-            'letter-spacing:1px;text-transform:uppercase;">◆ Ready to Download</div>',
+            'letter-spacing:1px;">◆ READY TO DOWNLOAD</div>',
             unsafe_allow_html=True,
         )
         dl_col1, dl_col2 = st.columns(2)
@@ -153,24 +172,25 @@ def render_export_tab(products_df: pd.DataFrame) -> None:
 
 def _generate_files(products_df, client_name, selection_map):
     """Internal helper: build and store PDF + Excel in session state."""
-    cart_data   = st.session_state.cart
-    schema_cols = [
-        "Catalogue", "Category", "Subcategory", "ItemName",
-        "Fragrance", "SKU Code", "ImageB64", "Packaging", "IsNew",
-    ]
-    df = pd.DataFrame(cart_data)
-    for col in schema_cols:
-        if col not in df.columns:
-            df[col] = ""
+    # Columnar cart snapshot (shared, read-only — derive, don't mutate)
+    df = get_cart_df()
 
     # Sort products in the same order as original Excel catalogues
-    fresh_df     = load_data_cached(st.session_state.data_timestamp)
-    pid_to_order = {row["ProductID"]: i for i, row in fresh_df.iterrows()}
-    if "ProductID" in df.columns:
-        df["_order"] = df["ProductID"].map(pid_to_order).fillna(len(fresh_df))
-        df = df.sort_values("_order").drop(columns=["_order"])
-
-    df["SerialNo"] = range(1, len(df) + 1)
+    # (binary search into the master ProductID column; unknown pids go last)
+    # (products_df is this run's load_data_cached result — no need to re-fetch)
+    master_pids = products_df["ProductID"].to_numpy(dtype=str)
+    cart_pids   = df["ProductID"].to_numpy(dtype=str)
+    sorter      = np.argsort(master_pids, kind="stable")
+    pos         = np.searchsorted(master_pids, cart_pids, sorter=sorter)
+    pos         = np.minimum(pos, max(len(master_pids) - 1, 0))
+    if len(master_pids):
+        order = sorter[pos]
+        order[master_pids[order] != cart_pids] = len(master_pids)
+    else:
+        order = np.zeros(len(cart_pids), dtype=np.intp)
+    df = df.iloc[np.argsort(order, kind="stable")].assign(
+        SerialNo=np.arange(1, len(df) + 1)
+    )
 
     progress = st.progress(0, text="Starting…")
 
@@ -4,117 +4,163 @@ HEM Product Catalogue v3 — Tab 1: Filter Products
 Lets users browse, search, and select products to add to the cart.
 
 Layout:
-  • Global search bar (searches ItemName, Fragrance, SKU Code)
+  • Global search form (searches ItemName, Fragrance, SKU Code on submit)
   • Search mode  → shows matching products with all categories expanded
   • Filter mode  → Catalogue selectbox → Category multiselect
                    → per-category Subcategory multiselect
   • Action buttons: ADD SELECTED · ADD FILTERED · Clear Filters
-  • Product list: thumbnail | name + badges | checkbox
+  • Product list: one grid per category — thumbnail | name | tags | select
 
 NOTE: "Select All Categories" and "Deselect All" buttons are
       intentionally NOT present in this version.
 """
+import hashlib
+
+import numpy as np
 import pandas as pd
 import streamlit as st
 
-from config import NO_SELECTION_PLACEHOLDER
-from database import load_products_db
-from data_loader import create_safe_id
-from cart import add_to_cart, add_selected_visible_to_cart, clear_filters_dropdown
-from ui.components import product_thumbnail_html, stats_bar, empty_state
+from config import NO_SELECTION_PLACEHOLDER, BLANK_SUBCATEGORIES
+from database import get_overridden_pids
+from data_loader import create_safe_id, build_search_index, build_taxonomy
+from cart import (
+    add_to_cart, add_selected_visible_to_cart, clear_filters_dropdown,
+    get_cart_pids, get_picked_pids,
+)
+from ui.components import stats_bar, empty_state, paginate
+
+PRODUCT_PAGE_SIZE = 50
+
+# Tag text for every combination of the four row flags, indexed by
+# NEW | EDITED << 1 | CUSTOM << 2 | IN CART << 3.
+_TAG_NAMES = ("NEW", "EDITED", "CUSTOM", "IN CART")
+_TAG_TABLE = np.array(
+    [
+        " · ".join(name for bit, name in enumerate(_TAG_NAMES) if code >> bit & 1)
+        for code in range(1 << len(_TAG_NAMES))
+    ],
+    dtype=object,
+)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 def _render_product_list(df: pd.DataFrame, expanded: bool = False) -> None:
     """
-    Render products grouped by Category inside collapsible expanders.
+    Render products grouped by Category, each behind an open/close toggle.
 
-    Each row shows:
-      [thumbnail] [product name + status badges] [checkbox]
+    Each category is one st.data_editor grid, paged PRODUCT_PAGE_SIZE rows
+    at a time:
+      [thumbnail] [product name] [status tags] [sub-category] [select]
+    Ticks are kept in one ProductID set (cart.get_picked_pids()), so a row
+    shows ticked wherever that product is rendered and hidden grids never
+    hold selections of their own.
 
     Args:
         df       – filtered product DataFrame to display
-        expanded – whether to open all expanders by default (used in search mode)
+        expanded – whether to open every category by default (used in search mode)
     """
     if df.empty:
         empty_state("🔍", "No products match your current filters or search.")
         return
 
-    # Collect ProductIDs already in cart for badge display
-    cart_pids = {item.get("ProductID") for item in st.session_state.cart}
-
-    # Load overridden ProductIDs for 'EDITED' badge
-    db            = load_products_db()
-    overridden_pids = set(db.get("product_overrides", {}).keys())
+    # ProductIDs already in cart / with saved edits, for tags
+    cart_pids       = get_cart_pids()
+    overridden_pids = get_overridden_pids()
+
+    # Row flags → tag text via one lookup into the precomputed table
+    pid_col = df["ProductID"]
+    in_cart = pid_col.isin(cart_pids).to_numpy()
+    picked  = get_picked_pids()
+    flags   = (
+        (df["IsNew"].to_numpy() == 1)
+        | pid_col.isin(overridden_pids).to_numpy() << 1
+        | df["IsCustom"].to_numpy(dtype=bool) << 2
+        | in_cart << 3
+    )
+    subcat = df["_subcat_cat"].astype(str).to_numpy()   # blanks already 'N/A'
+    df = df.assign(
+        _tags=_TAG_TABLE[flags.astype(np.intp)],
+        _subcat=np.where(subcat == "N/A", "", subcat),
+        _picked=pid_col.isin(picked).to_numpy(),
+    )
 
     # Group by Category (preserving original order)
-    for category, cat_df in df.groupby("Category", sort=False):
-        count = len(cat_df)
-
-        with st.expander(f"**{category}**  ·  {count} products", expanded=expanded):
-
-            # Bulk-add button for this category only
-            _, btn_col = st.columns([5, 1])
-            with btn_col:
-                if st.button(
-                    f"Add all {count}",
-                    key=f"add_all_{create_safe_id(category)}",
-                    use_container_width=True,
-                ):
-                    add_to_cart(cat_df)
-                    st.rerun()
-
-            # Iterate subcategories
-            for subcat, sub_df in cat_df.groupby("Subcategory", sort=False):
-                sub_str = str(subcat).strip()
-                # Only show subcategory header if it has a real value
-                if sub_str and sub_str.upper() != "N/A" and sub_str.lower() != "nan":
-                    st.markdown(
-                        f"<div class='subcat-header'>▸ {sub_str}"
-                        f" <span style='font-size:10px;opacity:0.6;'>({len(sub_df)})</span></div>",
-                        unsafe_allow_html=True,
-                    )
-
-                # Each product row
-                for _, row in sub_df.iterrows():
-                    pid         = row["ProductID"]
-                    cb_key      = f"checkbox_{pid}"
-                    in_cart     = pid in cart_pids
-                    is_new      = row.get("IsNew") == 1
-                    is_edited   = pid in overridden_pids
-                    is_custom   = str(pid).startswith("CUST_")
-
-                    # Build badge HTML
-                    badges = ""
-                    if is_new:
-                        badges += "<span class='badge-new'>NEW</span>"
-                    if is_edited:
-                        badges += "<span class='badge-modified'>EDITED</span>"
-                    if is_custom:
-                        badges += "<span class='badge-custom'>CUSTOM</span>"
-                    if in_cart:
-                        badges += "<span class='badge-in-cart'>IN CART</span>"
-
-                    # 3-column layout: thumb | name | checkbox
-                    c_thumb, c_name, c_check = st.columns([0.45, 7, 1])
-
-                    with c_thumb:
-                        st.markdown(
-                            product_thumbnail_html(row.get("ImageB64", ""), size=36),
-                            unsafe_allow_html=True,
-                        )
-                    with c_name:
-                        st.markdown(
-                            f"**{row['ItemName']}** {badges}",
-                            unsafe_allow_html=True,
-                        )
-                    with c_check:
-                        st.checkbox(
-                            "select",
-                            value=in_cart,
-                            key=cb_key,
-                            label_visibility="hidden",
-                        )
+    for category, cat_df in df.groupby("Category", sort=False, observed=True):
+        count   = len(cat_df)
+        safe_id = create_safe_id(category)
+
+        # Open/closed state per category; a closed category builds no widgets
+        # (an st.expander would still run its body and create the grid).
+        if not st.toggle(
+            f"**{category}**  ·  {count} products",
+            value=expanded,
+            key=f"open_{int(expanded)}_{safe_id}",
+        ):
+            continue
+
+        # Bulk-add button for this category only
+        _, btn_col = st.columns([5, 1])
+        with btn_col:
+            if st.button(
+                f"Add all {count}",
+                key=f"add_all_{safe_id}",
+                use_container_width=True,
+            ):
+                add_to_cart(cat_df)
+                st.rerun()
+
+        # Current page as one selection grid (one widget, not one per row)
+        page    = paginate(count, f"products_{safe_id}", PRODUCT_PAGE_SIZE)
+        page_df = cat_df.iloc[page]
+        page_pids = page_df["ProductID"].to_numpy()
+        # Grid key tracks exactly which products are on the page: a fixed-row
+        # data_editor keeps its edits by row position, so any change to the
+        # rows must start a fresh widget instead of moving ticks onto others.
+        pids_digest = hashlib.md5("\x1f".join(map(str, page_pids)).encode()).hexdigest()[:10]
+        images  = page_df["ImageB64"].fillna("").astype(str)
+        grid    = pd.DataFrame({
+            "ProductID":   page_pids,
+            "Thumb":       np.where(          # data URLs for this page only
+                images.str.len().to_numpy() > 100,
+                ("data:image/jpeg;base64," + images).to_numpy(dtype=object),
+                None,
+            ),
+            "Product":     page_df["ItemName"].to_numpy(),
+            "Tags":        page_df["_tags"].to_numpy(),
+            "Subcategory": page_df["_subcat"].to_numpy(),
+            "Selected":    page_df["_picked"].to_numpy(),
+        })
+        edited = st.data_editor(
+            grid,
+            column_config={
+                "Thumb":       st.column_config.ImageColumn("", width="small"),
+                "Product":     st.column_config.TextColumn("Product",      width="large"),
+                "Tags":        st.column_config.TextColumn("Tags",         width="small"),
+                "Subcategory": st.column_config.TextColumn("Sub-Category", width="medium"),
+                "Selected":    st.column_config.CheckboxColumn("Select",   width="small"),
+            },
+            column_order=["Thumb", "Product", "Tags", "Subcategory", "Selected"],
+            disabled=["Thumb", "Product", "Tags", "Subcategory"],
+            hide_index=True,
+            use_container_width=True,
+            key=f"grid_{safe_id}_{pids_digest}",
+        )
+        # Fold this page's ticks into the shared selection (read by ADD SELECTED)
+        ticked = edited["Selected"].to_numpy(dtype=bool)
+        picked.update(page_pids[ticked])
+        picked.difference_update(page_pids[~ticked])
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+def _search_mask(idx: dict, term: str) -> np.ndarray:
+    """
+    Boolean row mask: term is a substring of name, fragrance or SKU.
+
+    One substring test per row against the prebuilt lower-cased search blob
+    (name, fragrance and SKU joined), instead of one scan per column.
+    """
+    blob = idx["blob"]
+    return np.fromiter((term in row for row in blob), dtype=bool, count=len(blob))
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -127,29 +173,35 @@ def render_filter_tab(products_df: pd.DataFrame) -> None:
         st.error("⚠️ No product data found. Check Excel file paths or run **Refresh** in the sidebar.")
         return
 
-    working_df = products_df.copy()
+    working_df = products_df   # only ever rebound below, never mutated
 
     # ── Global search bar ─────────────────────────────────────────────────
+    # Inside a form, typing does not rerun the script; the query is only
+    # applied on Enter / Search, so the filter + render runs once per search.
     def _sync_search():
         st.session_state.item_search_query = st.session_state["_search_input_key"]
 
-    search_term = st.text_input(
-        "🔍 Global Search — products, fragrances, SKU codes",
-        value=st.session_state.item_search_query,
-        key="_search_input_key",
-        on_change=_sync_search,
-        placeholder="e.g. Rose, Lavender, HEM-001 …",
-    ).strip().lower()
+    with st.form("search_form", clear_on_submit=False):
+        c_input, c_submit = st.columns([6, 1])
+        with c_input:
+            st.text_input(
+                "🔍 Global Search — products, fragrances, SKU codes",
+                value=st.session_state.item_search_query,
+                key="_search_input_key",
+                placeholder="e.g. Rose, Lavender, HEM-001 …",
+            )
+        with c_submit:
+            st.markdown('<div style="margin-top:28px;"></div>', unsafe_allow_html=True)
+            st.form_submit_button("Search", on_click=_sync_search, use_container_width=True)
+
+    search_term = st.session_state.item_search_query.strip().lower()
 
     # ═════════════════════════════════════════════════════════════════════
     # SEARCH MODE
     # ═════════════════════════════════════════════════════════════════════
     if search_term:
-        working_df = products_df[
-            products_df["ItemName"].str.lower().str.contains(search_term, na=False) |
-            products_df["Fragrance"].str.lower().str.contains(search_term, na=False) |
-            products_df["SKU Code"].str.lower().str.contains(search_term, na=False)
-        ]
+        idx = build_search_index(products_df, st.session_state.data_timestamp)
+        working_df = products_df[_search_mask(idx, search_term)]
         stats_bar([
             ("Search results", f"{len(working_df)} products"),
             ("Cart", f"{len(st.session_state.cart)} items"),
@@ -162,10 +214,14 @@ def render_filter_tab(products_df: pd.DataFrame) -> None:
     # ═════════════════════════════════════════════════════════════════════
     col_filters, col_actions = st.columns([3, 1])
 
+    # Catalogue → Category → Subcategory lookups (cached per data version)
+    taxonomy, catalogue_rows, category_rows = build_taxonomy(
+        products_df, st.session_state.data_timestamp
+    )
+
     with col_filters:
         # ── Catalogue selectbox ───────────────────────────────────────────
-        catalogue_opts = [NO_SELECTION_PLACEHOLDER] + \
-                         products_df["Catalogue"].unique().tolist()
+        catalogue_opts = [NO_SELECTION_PLACEHOLDER] + list(taxonomy)
         try:
             cat_idx = catalogue_opts.index(
                 st.session_state.selected_catalogue_dropdown
@@ -182,8 +238,8 @@ def render_filter_tab(products_df: pd.DataFrame) -> None:
 
         # ── Category multi-select (visible only after a catalogue is chosen) ──
         if selected_catalogue != NO_SELECTION_PLACEHOLDER:
-            catalogue_df   = products_df[products_df["Catalogue"] == selected_catalogue]
-            all_categories = catalogue_df["Category"].unique().tolist()
+            catalogue_df   = products_df.iloc[catalogue_rows[selected_catalogue]]
+            all_categories = list(taxonomy[selected_catalogue])
 
             # Sanitise session state in case catalogue changed
             valid_cats = [
@@ -202,52 +258,53 @@ def render_filter_tab(products_df: pd.DataFrame) -> None:
             st.session_state.selected_categories_multi = selected_categories
 
             # ── Per-category subcategory multi-select ─────────────────────
-            filtered_parts: list[pd.DataFrame] = []
-
             if selected_categories:
+                # One row mask over products_df, filled in per category
+                keep         = np.zeros(len(products_df), dtype=bool)
+                subcat_col   = products_df["_subcat_cat"]
+                subcat_codes = subcat_col.cat.codes.to_numpy()
+
                 st.markdown(
                     '<div class="gold-divider" style="margin:10px 0 8px;"></div>',
                     unsafe_allow_html=True,
                 )
                 st.markdown(
                     '<span style="font-size:12px;color:#6b4040;'
-                    'text-transform:uppercase;letter-spacing:1px;">'
-                    '⬧ Sub-Category Filters</span>',
+                    'letter-spacing:1px;">'
+                    '⬧ SUB-CATEGORY FILTERS</span>',
                     unsafe_allow_html=True,
                 )
 
                 for cat in selected_categories:
-                    cat_data   = catalogue_df[catalogue_df["Category"] == cat]
-                    raw_subs   = cat_data["Subcategory"].unique().tolist()
+                    cat_rows   = category_rows[(selected_catalogue, cat)]
+                    raw_subs   = taxonomy[selected_catalogue][cat]
                     clean_subs = [
                         s for s in raw_subs
-                        if str(s).strip()
-                        and str(s).strip().upper() != "N/A"
-                        and str(s).strip().lower() != "nan"
+                        if str(s).strip().upper() not in BLANK_SUBCATEGORIES
                     ]
 
                     if clean_subs:
                         chosen_subs = st.multiselect(
                             f"Sub-categories for **{cat}**",
                             clean_subs,
-                            default=clean_subs,   # start with all selected
                             key=f"sub_{create_safe_id(cat)}",
+                            placeholder="All sub-categories",
                         )
-                        # Keep all items with chosen subcategory OR no subcategory
-                        mask = (
-                            cat_data["Subcategory"].isin(chosen_subs) |
-                            cat_data["Subcategory"].isin(["N/A", "nan", ""]) |
-                            cat_data["Subcategory"].isna()
+                        # Nothing picked (the default) or everything picked → no filter
+                        if not chosen_subs or (
+                            len(chosen_subs) == len(clean_subs) and set(chosen_subs) == set(clean_subs)
+                        ):
+                            keep[cat_rows] = True
+                            continue
+                        # Keep chosen subcategories + 'N/A' via integer codes
+                        allowed = subcat_col.cat.categories.get_indexer(
+                            list(chosen_subs) + ["N/A"]
                         )
-                        filtered_parts.append(cat_data[mask])
+                        keep[cat_rows[np.isin(subcat_codes[cat_rows], allowed[allowed >= 0])]] = True
                     else:
-                        filtered_parts.append(cat_data)
+                        keep[cat_rows] = True
 
-                working_df = (
-                    pd.concat(filtered_parts, ignore_index=True)
-                    if filtered_parts
-                    else pd.DataFrame(columns=products_df.columns)
-                )
+                working_df = products_df[keep]
             else:
                 # No categories selected — show full catalogue
                 working_df = catalogue_df
@@ -2,12 +2,12 @@
 HEM Product Catalogue v3 — Tab 2: Review & Edit Cart
 Inline editing, change detection, per-row removal, and cart clear.
 """
-import time
-import pandas as pd
+import numpy as np
 import streamlit as st
 
-from database import load_products_db, save_product_override, save_cart_to_db
-from cart import remove_from_cart, clear_cart
+from database import get_overridden_pids, save_product_overrides
+from data_loader import bump_data_version
+from cart import remove_from_cart, clear_cart, update_cart_items, get_cart_df, get_cart_names_lc
 from ui.components import section_header, stats_bar, confirm_action, empty_state, gold_divider
 
 
@@ -19,7 +19,7 @@ def render_review_tab() -> None:
         empty_state("🛒", "Your cart is empty. Go to <strong>Filter Products</strong> to add items.")
         return
 
-    cart_df = pd.DataFrame(st.session_state.cart)
+    cart_df = get_cart_df()
 
     # ── In-cart search ────────────────────────────────────────────────────
     search = st.text_input(
@@ -28,32 +28,28 @@ def render_review_tab() -> None:
         key="cart_search_input",
     ).strip().lower()
     if search:
-        cart_df = cart_df[
-            cart_df["ItemName"].str.lower().str.contains(search, na=False)
-        ]
+        # Substring test against the cart's cached lower-cased names
+        cart_df = cart_df[np.char.find(get_cart_names_lc(), search) >= 0]
 
-    # ── Load DB for status badges ─────────────────────────────────────────
-    db              = load_products_db()
-    overridden_pids = set(db.get("product_overrides", {}).keys())
+    # ── Status badges (override set cached alongside the DB) ──────────────
+    overridden_pids = get_overridden_pids()
 
-    def _status(pid):
-        parts = []
-        if pid in overridden_pids:
-            parts.append("Edited")
-        if str(pid).startswith("CUST_"):
-            parts.append("Custom")
-        return ", ".join(parts)
+    is_edited = cart_df["ProductID"].isin(overridden_pids).to_numpy()
+    is_custom = cart_df["ProductID"].astype(str).str.startswith("CUST_").to_numpy()
 
-    cart_df["Status"] = cart_df["ProductID"].apply(_status)
-    cart_df["Remove"] = False
+    cart_df = cart_df.assign(
+        Status=np.where(
+            is_edited & is_custom, "Edited, Custom",
+            np.where(is_edited, "Edited", np.where(is_custom, "Custom", "")),
+        ),
+        Remove=False,
+    )
 
     # ── Stats bar ─────────────────────────────────────────────────────────
-    edited_count = sum(1 for p in cart_df["ProductID"] if p in overridden_pids)
-    custom_count = sum(1 for p in cart_df["ProductID"] if str(p).startswith("CUST_"))
     stats_bar([
         ("Total Items",  str(len(cart_df))),
-        ("Edited",       str(edited_count)),
-        ("Custom",       str(custom_count)),
+        ("Edited",       str(int(is_edited.sum()))),
+        ("Custom",       str(int(is_custom.sum()))),
     ])
 
     # ── Editable data table ───────────────────────────────────────────────
@@ -61,9 +57,6 @@ def render_review_tab() -> None:
         "Catalogue", "Category", "Subcategory", "ItemName",
         "Fragrance", "SKU Code", "Status", "Remove",
     ]
-    for col in display_cols:
-        if col not in cart_df.columns:
-            cart_df[col] = ""
 
     edited_df = st.data_editor(
         cart_df[display_cols],
@@ -84,18 +77,23 @@ def render_review_tab() -> None:
     )
 
     # ── Detect field changes ──────────────────────────────────────────────
+    # One element-wise comparison over the stripped text grids (rows align
+    # by position — num_rows="fixed"); only changed rows are visited in Python.
     editable_fields = ["Catalogue", "Category", "Subcategory", "ItemName", "Fragrance", "SKU Code"]
-    changes: dict = {}
-    for i in range(min(len(cart_df), len(edited_df))):
-        pid          = cart_df.iloc[i]["ProductID"]
-        field_delta  = {}
-        for f in editable_fields:
-            orig = str(cart_df.iloc[i].get(f, "")).strip()
-            edit = str(edited_df.iloc[i].get(f, "")).strip()
-            if orig != edit:
-                field_delta[f] = edit
-        if field_delta:
-            changes[pid] = field_delta
+
+    def _text_grid(frame):
+        return frame[editable_fields].fillna("").astype(str).apply(
+            lambda col: col.str.strip()
+        ).to_numpy()
+
+    orig_vals = _text_grid(cart_df)
+    edit_vals = _text_grid(edited_df)
+    diff      = orig_vals != edit_vals
+    pids      = cart_df["ProductID"].to_numpy()
+    changes: dict = {
+        pids[i]: {f: edit_vals[i, j] for j, f in enumerate(editable_fields) if diff[i, j]}
+        for i in np.flatnonzero(diff.any(axis=1))
+    }
 
     gold_divider()
 
@@ -106,22 +104,17 @@ def render_review_tab() -> None:
         btn_lbl   = f"💾 Save {len(changes)} Edit(s)" if changes else "No Changes"
         if st.button(btn_lbl, disabled=not changes,
                      use_container_width=True, type="primary"):
-            for pid, delta in changes.items():
-                save_product_override(pid, delta)
-                for item in st.session_state.cart:
-                    if item.get("ProductID") == pid:
-                        item.update(delta)
-            save_cart_to_db(st.session_state.cart)
-            st.session_state.data_timestamp = time.time()
-            st.cache_data.clear()
+            save_product_overrides(changes)    # one DB write for all rows
+            update_cart_items(changes)
+            st.session_state.data_timestamp = bump_data_version()
             st.toast(f"Saved {len(changes)} edit(s)!", icon="✅")
             st.rerun()
 
     with col_remove:
-        to_remove_idx  = edited_df[edited_df["Remove"] == True].index.tolist()
+        remove_mask    = edited_df["Remove"].to_numpy(dtype=bool)
         pids_to_remove = (
-            cart_df.loc[to_remove_idx, "ProductID"].tolist()
-            if to_remove_idx else []
+            cart_df["ProductID"].to_numpy()[remove_mask].tolist()
+            if remove_mask.any() else []
         )
         if st.button(
             f"🗑 Remove {len(pids_to_remove)} Selected",
@@ -145,11 +138,11 @@ def render_review_tab() -> None:
     if changes:
         gold_divider()
         with st.expander(f"👁 Preview {len(changes)} Pending Edit(s)", expanded=True):
-            for pid, delta in changes.items():
-                orig_row  = cart_df[cart_df["ProductID"] == pid]
-                orig_name = orig_row.iloc[0]["ItemName"] if not orig_row.empty else pid
-                change_str = " · ".join(
-                    f"**{k}** → `{v}`" for k, v in delta.items()
-                )
-                st.markdown(f"▸ **{orig_name}** — {change_str}")
+            # All pending edits as one markdown block (one element, not one per row)
+            names = dict(zip(pids, cart_df["ItemName"].to_numpy()))
+            st.markdown("  \n".join(
+                f"▸ **{names.get(pid, pid)}** — "
+                + " · ".join(f"**{k}** → `{v}`" for k, v in delta.items())
+                for pid, delta in changes.items()
+            ))
             st.info("Click **Save Edit(s)** above to permanently save these changes.")